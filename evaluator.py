@@ -1,9 +1,23 @@
 from math      import sqrt, floor
 from typing    import List, Tuple, Callable
 from itertools import product
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 
 import os
-import json
+
+import numpy as np
+
+try:
+    from orjson import loads as json_loads
+except ImportError: # orjson is optional: without it, the standard json module parses the files
+    from json import loads as json_loads
+
+try:
+    from numba import njit
+except ImportError: # numba is optional: without it, the jitted functions run as plain Python
+    def njit( *args, **kwargs ):
+        return lambda func: func
 
 INF_RETURN = 'inf'    # value to indicate infeasible solutions
 EPS_VALUE  = 0.000001 # tolerance
@@ -12,13 +26,37 @@ INSTANCE_DIRECTORY = os.path.join( '.', 'instances' )
 SOLUTION_DIRECTORY = os.path.join( '.', 'solutions' )
 OUTPUT_DIRECTORY   = os.path.join( '.' )
 __tempfile = 'temp.csv'
+__buffsize = 1 << 20 # buffer size of the output files
 
 # instance : list of locations (location: dictionary of demands (demand) and coordinates (x and y), where the first locations refer to plants)
 # solution : list of routes (route: list of batches (batch: list of customer indices))
 
+def round2( x:float ) -> float:
+    """
+    Rounds the given value to 2 decimals (same as 'lambda x: round(x,2)').
+    """
+    return round( x, 2 )
+
+# array counterparts of common rounding functions, applied to whole travel time matrices at once
+# (no counterpart for 'round2': np.round does not round the exact decimal value as the built-in 'round' does, e.g., for 0.015)
+_ROUNDING_UFUNCS = {
+    floor  : lambda dist: np.floor( dist ).astype( np.int64 ), # integer travel times
+}
+
+def validate_locations( locations:List[dict] ) -> None:
+    """
+    Checks that each location has coordinates (x and y) and demand.
+
+    Parameters:
+        - locations: list of location dictionaries, where first elements represent the plants
+    """
+    for location in locations:
+        assert 'x' in location and 'y' in location and 'demand' in location, f'invalid location dictionary ({location})!'
+
 def get_travel_time( locations:List[dict], loc_a:int, loc_b:int, rounding_func:Callable[[float],float]= None ) -> float:
     """
     Returns the travel time (actually, the Euclidean distance) between the given locations.
+    Locations are not checked (see 'validate_locations').
 
     Parameters:
         - locations:     list of location dictionaries, where first elements represent the plants
@@ -29,19 +67,188 @@ def get_travel_time( locations:List[dict], loc_a:int, loc_b:int, rounding_func:C
 
     Returns: travel time from location 'loc_a' to location 'loc_b'
     """
-    assert 0 <= loc_a and loc_a < len(locations), f'invalid location index ({loc_a})!'
-    assert 0 <= loc_b and loc_b < len(locations), f'invalid location index ({loc_b})!'
-    assert all( key in locations[loc_a].keys() for key in ['x','y'] ), f'invalid location dictionary ({locations[loc_a]})!'
-    assert all( key in locations[loc_b].keys() for key in ['x','y'] ), f'invalid location dictionary ({locations[loc_b]})!'
+    dx = locations[loc_a]['x'] - locations[loc_b]['x']
+    dy = locations[loc_a]['y'] - locations[loc_b]['y']
 
-    dist = sqrt( float((locations[loc_a]['x'] - locations[loc_b]['x'])**2 + (locations[loc_a]['y'] - locations[loc_b]['y'])**2) )
+    dist = sqrt( float(dx*dx + dy*dy) )
 
     if rounding_func is None:
         return dist
     
     return rounding_func( dist )
 
-def evaluate( locations:List[dict], capacity:int, lifespan:int, rate:int, solution:List[List[List[int]]], rounding_func:Callable[[float],float]= None, check_feasibility:bool= True, print_reason:bool= False, print_solution:bool= False ) -> float:
+def _to_soa( locations:List[dict] ) -> Tuple[np.ndarray,np.ndarray,np.ndarray]:
+    """
+    Returns the x coordinates, the y coordinates, and the demands of the locations as separate arrays.
+    """
+    x      = np.fromiter( (location['x'] for location in locations), dtype= np.float64, count= len(locations) )
+    y      = np.fromiter( (location['y'] for location in locations), dtype= np.float64, count= len(locations) )
+    demand = np.fromiter( (location['demand'] for location in locations), dtype= np.int64, count= len(locations) )
+
+    return x, y, demand
+
+def _travel_times( x:np.ndarray, y:np.ndarray, rounding_func:Callable[[float],float]= None ) -> np.ndarray:
+    """
+    Returns the matrix of travel times between the locations with the given coordinates (see 'build_distance_matrix').
+    """
+    dx = np.subtract.outer( x, x )
+    dy = np.subtract.outer( y, y )
+
+    dist = np.sqrt( dx*dx + dy*dy )
+
+    if rounding_func is None:
+        return dist
+
+    # looked up by identity, as the rounding function may be unhashable
+    for (func, ufunc) in _ROUNDING_UFUNCS.items():
+        if rounding_func is func:
+            return ufunc( dist )
+
+    # integer travel times (e.g., with 'ceil') are kept integer, as they are reported as such
+    dist = np.array( [ rounding_func( value ) for value in dist.ravel().tolist() ] ).reshape( dist.shape )
+    if dist.dtype.kind != 'i':
+        dist = dist.astype( np.float64 )
+
+    return dist
+
+def build_distance_matrix( locations:List[dict], rounding_func:Callable[[float],float]= None ) -> np.ndarray:
+    """
+    Returns the matrix of travel times (actually, Euclidean distances) between the locations.
+
+    Parameters:
+        - locations:     list of location dictionaries, where first elements represent the plants
+        - rounding_func: function to be invoked on the travel times (may be None)
+            - examples: 'floor', 'round2', 'lambda x: round(x,2)', etc.
+            - 'floor' is applied to the whole matrix at once, others element by element
+
+    Returns: matrix whose element (a,b) is the travel time from location 'a' to location 'b'
+    """
+    x, y, _ = _to_soa( locations )
+
+    return _travel_times( x, y, rounding_func )
+
+def build_demand_vector( locations:List[dict] ) -> np.ndarray:
+    """
+    Returns the demands of the locations.
+
+    Parameters:
+        - locations: list of location dictionaries, where first elements represent the plants
+
+    Returns: vector whose element 'a' is the demand of location 'a'
+    """
+    return _to_soa( locations )[2]
+
+def _flatten_route( route:List[List[int]] ) -> Tuple[np.ndarray,np.ndarray]:
+    """
+    Returns the customers of the batches of the given route concatenated, and the positions where the batches start (and the last ends).
+    """
+    lengths = [ len(batch) for batch in route ]
+    if 0 in lengths:
+        raise ValueError( f'empty batch in route {route}!' )
+
+    starts = np.zeros( len(route) + 1, dtype= np.intp )
+    np.cumsum( lengths, out= starts[1:] )
+
+    flat = np.concatenate( [ np.asarray( batch, dtype= np.intp ) for batch in route ] ) if len(route) > 0 else np.empty( 0, dtype= np.intp )
+
+    return starts, flat
+
+@njit( cache= True, boundscheck= True )
+def _evaluate_route( distances:np.ndarray, demands:np.ndarray, plant:int, starts:np.ndarray, flat:np.ndarray, capacity:int, lifespan:int, rate:float, check_feasibility:bool, schedule:np.ndarray ) -> Tuple[float,int]:
+    """
+    Evaluates the given route (see '_flatten_route') in a single pass over its batches.
+    If 'schedule' has a row for each batch, demand, travel time, production finish time, and transportation finish time of the scheduled batches are stored in it.
+
+    Returns: transportation finish time of the last batch, and index of the first batch violating capacity or lifespan (-1 if none)
+    """
+    curr_p_finish = 0.0
+    curr_t_finish = 0.0
+
+    for k in range(len(starts) - 1):
+        demand = 0
+        legs   = 0 # integer for integer travel times (e.g., with 'floor')
+        for j in range(starts[k], starts[k+1]):
+            demand += demands[flat[j]]
+            if j > starts[k]:
+                legs += distances[flat[j-1], flat[j]]
+
+        t_out = distances[plant, flat[starts[k]]] + legs
+
+        if check_feasibility and (capacity + EPS_VALUE <= demand or lifespan + EPS_VALUE <= t_out):
+            return curr_t_finish, k
+
+        p_time    = demand / rate
+        t_time    = t_out + distances[flat[starts[k+1]-1], plant]
+        max_delay = max( 0, lifespan - t_out ) # negative delay (infeasible solution!) could cause inconsistency between production finish and transportation start
+
+        earliest_p_finish = curr_p_finish + p_time
+
+        if curr_t_finish <= earliest_p_finish:
+            curr_p_finish = earliest_p_finish
+            curr_t_finish = curr_p_finish + t_time
+        else:
+            curr_p_finish = max( earliest_p_finish, curr_t_finish - max_delay )
+            curr_t_finish = curr_t_finish + t_time
+
+        if len(schedule) > 0:
+            schedule[k,0] = demand
+            schedule[k,1] = t_time
+            schedule[k,2] = curr_p_finish
+            schedule[k,3] = curr_t_finish
+
+    return curr_t_finish, -1
+
+_NO_SCHEDULE = np.empty( (0,4), dtype= np.float64 )
+
+def _print_violation( distances:np.ndarray, demands:np.ndarray, plant:int, batch:List[int], capacity:int, lifespan:int ) -> None:
+    """
+    Prints why the given batch violates capacity or lifespan.
+    """
+    batch = np.asarray( batch, dtype= np.intp )
+
+    demand = demands[batch].sum()
+    if capacity + EPS_VALUE <= demand:
+        print( f'demand of batch {batch.tolist()} exceeds the capacity limit ({capacity} < {demand})!' )
+        return
+
+    t_out = distances[plant,batch[0]]
+    for j in range(1, len(batch)):
+        t_out = t_out + distances[batch[j-1],batch[j]]
+    print( f'batch {batch.tolist()} violates lifespan constraint (last delivery= {t_out} > {lifespan})!' )
+
+def _visits_all_customers( locations:List[dict], solution:List[List[List[int]]], print_reason:bool= False ) -> bool:
+    """
+    Checks whether the given solution visits each customer exactly once.
+
+    Parameters:
+        - locations:    instance dictionary
+        - solution:     list of routes (route = list of batches (batch = list of customers))
+        - print_reason: should we print reason of infeasibility, if any?
+
+    Returns: True if each customer is visited exactly once
+    """
+
+    nplants = len(solution)
+
+    batches = [ batch for route in solution for batch in route ]
+
+    # batches are converted one by one, as an empty list would be read as a float array
+    visited_customers = np.concatenate( [ np.asarray( batch, dtype= np.int64 ) for batch in batches ] ) if len(batches) > 0 else np.empty( 0, dtype= np.int64 )
+    visited_customers.sort()
+
+    if visited_customers.size != len(locations) - nplants:
+        if print_reason:
+            print( f'invalid number of visited customers! Visited: {visited_customers.tolist()}' )
+        return False
+
+    if not np.array_equal( visited_customers, np.arange( nplants, nplants + visited_customers.size ) ):
+        if print_reason:
+            print( f'missing customer! Visited: {visited_customers.tolist()}' )
+        return False
+
+    return True
+
+def evaluate( locations:List[dict], capacity:int, lifespan:int, rate:int, solution:List[List[List[int]]], rounding_func:Callable[[float],float]= None, check_feasibility:bool= True, print_reason:bool= False, print_solution:bool= False, distances:np.ndarray= None, demands:np.ndarray= None ) -> float:
     """
     Evaluates the given solution.
 
@@ -56,30 +263,22 @@ def evaluate( locations:List[dict], capacity:int, lifespan:int, rate:int, soluti
         - check_feasibility: should we check solution feasibility?
         - print_reason:      should we print reason of infeasibility, if any?
         - print_solution:    should we print evaluated solution?
+        - distances:         travel time matrix of the instance (see 'build_distance_matrix'), if already computed
+                               - if given, 'rounding_func' is ignored
+        - demands:           demand vector of the instance (see 'build_demand_vector'), if already computed
 
     Returns: makespan of the given solution
     """
 
-    nplants = len(solution)
+    if distances is None:
+        distances = build_distance_matrix( locations, rounding_func )
 
-    # check customers, if needed
-    if check_feasibility:
-        visited_customers = []
-        for batch in solution:
-            for batch in batch:
-                visited_customers.extend( batch )
-        visited_customers.sort()
-
-        if len(visited_customers) != len(locations) - nplants:
-            if print_reason:
-                print( f'invalid number of visited customers! Visited: {visited_customers}' )
-            return INF_RETURN
+    if demands is None:
+        demands = build_demand_vector( locations )
 
-        for i in range(0,len(visited_customers)):
-            if visited_customers[i] != i+nplants:
-                if print_reason:
-                    print( f'missing customer! Visited: {visited_customers}' )
-                return INF_RETURN
+    # check customers, if needed
+    if check_feasibility and not _visits_all_customers( locations, solution, print_reason ):
+        return INF_RETURN
 
     makespan = 0
 
@@ -88,59 +287,80 @@ def evaluate( locations:List[dict], capacity:int, lifespan:int, rate:int, soluti
         if print_solution:
             print( '-'*60 )
 
-        curr_p_finish = 0
-        curr_t_finish = 0
+        route = solution[plant]
+        if len(route) == 0:
+            continue
 
-        for batch in solution[plant]:
-            p_time = sum( locations[location]['demand'] for location in batch )
+        starts, flat  = _flatten_route( route )
+        schedule      = np.empty( (len(route),4), dtype= np.float64 ) if print_solution else _NO_SCHEDULE
+        (t_finish, k) = _evaluate_route( distances, demands, plant, starts, flat, capacity, lifespan, float(rate), check_feasibility, schedule )
 
-            if check_feasibility and capacity + EPS_VALUE <= p_time:
-                if print_reason:
-                    print( f'demand of batch {batch} exceeds the capacity limit ({capacity} < {p_time})!' )
-                return INF_RETURN
-            
-            p_time /= float(rate)
+        if print_solution:
+            for j in range(k if k >= 0 else len(route)):
+                (demand, t_time, p_finish, t_finish_j) = schedule[j]
+                p_time  = demand / float(rate)
+                loc_str = ' -> '.join( f'{location:2d}' for location in route[j] )
+                print( f'{int(demand)} {p_time:6.2f} {t_time:6.2f} [{p_finish-p_time:8.2f} {p_finish:8.2f}] [{t_finish_j-t_time:8.2f} {t_finish_j:8.2f}] {loc_str}' )
 
-            t_time = get_travel_time( locations, plant, batch[0], rounding_func )
-            t_time += sum( get_travel_time( locations, batch[cust-1], batch[cust], rounding_func ) for cust in range(1,len(batch)) )
+        if k >= 0:
+            if print_reason:
+                _print_violation( distances, demands, plant, route[k], capacity, lifespan )
+            return INF_RETURN
 
-            if check_feasibility and lifespan + EPS_VALUE <= t_time:
-                if print_reason:
-                    print( f'batch {batch} violates lifespan constraint (last delivery= {t_time} > {lifespan})!' )
-                return INF_RETURN
+        makespan = max( makespan, float( t_finish ) )
 
-            max_delay = max( 0, lifespan - t_time ) # negative delay (infeasible solution!) could cause inconsistency between production finish and transportation start
-            t_time += get_travel_time( locations, batch[-1], plant, rounding_func )
+    if print_solution:
+        print( '-'*60 )
 
-            earliest_p_finish = curr_p_finish + p_time
+    return makespan
+    
+def evaluate_solutions_with_distances( locations:List[dict], capacity:int, lifespan:int, rate:int, solutions:List[List[List[List[int]]]], distances:np.ndarray, demands:np.ndarray= None, check_feasibility:bool= True ) -> List[List[float]]:
+    """
+    Evaluates the given solutions with several travel time matrices (e.g., with different rounding functions) at once.
+    Customers and batches of the solutions are checked and prepared once for all matrices.
 
-            next_p_finish = 0
-            next_t_finish = 0
-            if curr_t_finish <= earliest_p_finish:
-                next_p_finish = curr_p_finish + p_time
-                next_t_finish = next_p_finish + t_time
-            else:
-                next_t_finish = curr_t_finish + t_time
-                next_p_finish = max( earliest_p_finish, curr_t_finish - max_delay )
+    Parameters:
+        - solutions: list of solutions (solution = list of routes)
+        - distances: travel time matrices of the instance stacked along the first axis (see 'build_distance_matrix')
+        - ...        (see 'evaluate')
 
-            if print_solution:
-                demand = sum( locations[location]['demand'] for location in batch )
-                loc_str = ' -> '.join( f'{location:2d}' for location in batch )
-                print( f'{demand} {p_time:6.2f} {t_time:6.2f} [{next_p_finish-p_time:8.2f} {next_p_finish:8.2f}] [{next_t_finish-t_time:8.2f} {next_t_finish:8.2f}] {loc_str}' )
+    Returns: makespans of each given solution, one for each travel time matrix
+    """
 
-            curr_p_finish = next_p_finish
-            curr_t_finish = next_t_finish
+    nmatrices = len(distances)
 
-        makespan = max( makespan, curr_t_finish )
+    if demands is None:
+        demands = build_demand_vector( locations )
 
-    if print_solution:
-        print( '-'*60 )
+    makespans = [ [0] * nmatrices for _ in solutions ]
 
-    return makespan
-    
+    for s in range(len(solutions)):
+        # check customers, if needed
+        if check_feasibility and not _visits_all_customers( locations, solutions[s] ):
+            makespans[s] = [INF_RETURN] * nmatrices
+            continue
+
+        # evaluate (non-empty) routes
+        for plant in range(len(solutions[s])):
+            route = solutions[s][plant]
+            if len(route) == 0:
+                continue
+
+            starts, flat = _flatten_route( route )
+            for k in range(nmatrices):
+                if makespans[s][k] == INF_RETURN:
+                    continue
+
+                (t_finish, j)   = _evaluate_route( distances[k], demands, plant, starts, flat, capacity, lifespan, float(rate), check_feasibility, _NO_SCHEDULE )
+                makespans[s][k] = INF_RETURN if j >= 0 else max( makespans[s][k], float( t_finish ) )
+
+    return makespans
+
+@lru_cache( maxsize= None )
 def read_geismar_instance( i:int ) -> List[dict]:
     """
     Reads and returns the corresponding instance of Geismar et al.
+    Instances are cached, hence the returned instance must not be modified.
     
     Parameters:
         - i: index of the desired instance (1,2,3,4,5,6)
@@ -148,12 +368,18 @@ def read_geismar_instance( i:int ) -> List[dict]:
     Returns: instance
     """
 
-    with open( os.path.join( INSTANCE_DIRECTORY, 'geismar', f'instance_i{i}.json' ) ) as ifile:
-        return json.load( ifile )
+    with open( os.path.join( INSTANCE_DIRECTORY, 'geismar', f'instance_i{i}.json' ), 'rb' ) as ifile:
+        instance = json_loads( ifile.read() )
+
+    validate_locations( instance )
+
+    return instance
     
+@lru_cache( maxsize= None )
 def read_canatasagun_instance( dem:int, loc:int, n:int, p:int, i:int ) -> List[dict]:
     """
     Reads and returns the corresponding instance of Can Atasagun & Karaoglan.
+    Instances are cached, hence the returned instance must not be modified.
     
     Parameters:
         - dem:   demand distribution (1: [100,200]; 2: [100,300])
@@ -164,9 +390,67 @@ def read_canatasagun_instance( dem:int, loc:int, n:int, p:int, i:int ) -> List[d
     Returns: instance
     """
 
-    with open( os.path.join( INSTANCE_DIRECTORY, 'canatasagun', f'instance_dem{dem}_loc{loc}_n{n}_p{p}_i{i}.json' ) ) as ifile:
-        return json.load( ifile )
+    with open( os.path.join( INSTANCE_DIRECTORY, 'canatasagun', f'instance_dem{dem}_loc{loc}_n{n}_p{p}_i{i}.json' ), 'rb' ) as ifile:
+        instance = json_loads( ifile.read() )
+
+    validate_locations( instance )
+
+    return instance
     
+@lru_cache( maxsize= None )
+def _instance_arrays( read_instance:Callable[...,List[dict]], *key ) -> Tuple[np.ndarray,np.ndarray,np.ndarray]:
+    """
+    Returns the (cached, read-only) x coordinates, y coordinates, and demands of the instance 'read_instance(*key)'.
+    """
+
+    arrays = _to_soa( read_instance( *key ) )
+    for array in arrays:
+        array.flags.writeable = False
+
+    return arrays
+
+def _demand_vector( read_instance:Callable[...,List[dict]], *key ) -> np.ndarray:
+    """
+    Returns the (cached, read-only) demand vector of the instance 'read_instance(*key)'.
+    """
+
+    return _instance_arrays( read_instance, *key )[2]
+
+def _distance_matrix( rounding_func:Callable[[float],float], read_instance:Callable[...,List[dict]], *key ) -> np.ndarray:
+    """
+    Returns the (read-only) travel time matrix of the instance 'read_instance(*key)' with the given rounding function.
+    Matrices are cached by the rounding function itself, i.e., by its identity for functions and lambdas (a new lambda means a new matrix).
+    Unhashable rounding functions are not cached.
+    """
+
+    try:
+        hash( rounding_func )
+    except TypeError:
+        return _uncached_distance_matrix( rounding_func, read_instance, *key )
+
+    return _cached_distance_matrix( rounding_func, read_instance, *key )
+
+def _uncached_distance_matrix( rounding_func:Callable[[float],float], read_instance:Callable[...,List[dict]], *key ) -> np.ndarray:
+    """
+    Computes the read-only travel time matrix of the instance 'read_instance(*key)' with the given rounding function (see '_distance_matrix').
+    """
+
+    x, y, _ = _instance_arrays( read_instance, *key )
+
+    distances = _travel_times( x, y, rounding_func )
+    distances.flags.writeable = False
+
+    return distances
+
+_cached_distance_matrix = lru_cache( maxsize= 256 )( _uncached_distance_matrix )
+
+def _as_index_arrays( solution:List[List[List[int]]] ) -> List[List[np.ndarray]]:
+    """
+    Returns the given solution with each batch converted to an index array, so that it is converted only once.
+    """
+
+    return [ [ np.asarray( batch, dtype= np.intp ) for batch in route ] for route in solution ]
+
 def read_solution_for_geismar_instance( directory:str, i:int, Q:int, B:int, r:int ) -> List[List[List[int]]]:
     """
     Reads solution for the corresponding instance of Geismar et al.
@@ -183,8 +467,8 @@ def read_solution_for_geismar_instance( directory:str, i:int, Q:int, B:int, r:in
 
     filename = os.path.join( directory, f'sol_i{i}_Q{Q}_B{B}_r{r}.json' )
 
-    with open( filename, 'r' ) as f:
-       return [ json.load( f ) ]
+    with open( filename, 'rb' ) as f:
+       return [ json_loads( f.read() ) ]
 
 def read_solution_for_canatasagun_instance( directory:str, dem:int, loc:int, n:int, p:int, i:int, Q:int, B:int, r:int ) -> List[List[List[int]]]:
     """
@@ -206,8 +490,8 @@ def read_solution_for_canatasagun_instance( directory:str, dem:int, loc:int, n:i
 
     filename = os.path.join( directory, f'sol_dem{dem}_loc{loc}_n{n}_p{p}_i{i}_Q{Q}_B{B}_r{r}.json' )
     
-    with open( filename, 'r' ) as f:
-        return json.load( f )
+    with open( filename, 'rb' ) as f:
+        return json_loads( f.read() )
    
 def evaluate_vns_solutions_for_geismar_instances( instances:List[int], capacities:List[int], lifespans:List[int], rates:List[int], rounding_func:Callable[[float],float]= None ) -> None:
     """
@@ -218,47 +502,78 @@ def evaluate_vns_solutions_for_geismar_instances( instances:List[int], capacitie
         - capacities:    capacity values to evaluate with
         - lifespans:     lifespan values to evaluate with
         - rates:         production rates to evaluate with
-        - rounding_func: rounding function
+        - rounding_func: rounding function (travel times are cached by its identity, see '_distance_matrix')
     """
 
     directory  = os.path.join( SOLUTION_DIRECTORY, 'geismar', 'horvath_vns' )
     outputfile = os.path.join( OUTPUT_DIRECTORY, __tempfile )
 
-    with open( outputfile, 'w' ) as f:
+    with open( outputfile, 'w', buffering= __buffsize ) as f:
         for i in instances:
-            instance = read_geismar_instance( i )
+            instance  = read_geismar_instance( i )
+            distances = _distance_matrix( rounding_func, read_geismar_instance, i )
+            demands   = _demand_vector( read_geismar_instance, i )
 
+            lines = []
             for (Q,B,r) in product(capacities,lifespans,rates):
-                solution = read_solution_for_geismar_instance( directory, i, Q, B, r )
-                round_makespan = evaluate( instance, Q, B, r, solution, check_feasibility= True, rounding_func= rounding_func )
+                solution = _as_index_arrays( read_solution_for_geismar_instance( directory, i, Q, B, r ) )
+                round_makespan = evaluate( instance, Q, B, r, solution, check_feasibility= True, distances= distances, demands= demands )
+
+                lines.append( f'{i};{Q};{B};{r};{round_makespan}\n' )
 
-                f.write( f'{i};{Q};{B};{r};{round_makespan}\n' )
+            f.write( ''.join( lines ) )
 
         print( f'values are written into "{outputfile}"' )
  
-def evaluate_vns_solutions_for_canatasagun_instances( dems:List[int], locs:List[int], nps:Tuple[List[int],List[int]], instances:List[int], capacities:List[int], lifespans:List[int], rates:List[int], rounding_func:Callable[[float],float]= None  ):
+def _evaluate_vns_solutions_for_canatasagun_instance( task:tuple ) -> List[str]:
+    """
+    Evaluates the solutions for a Can Atasagun & Karaoglan instance of the variable neighborhood search of Horvath (see 'evaluate_vns_solutions_for_canatasagun_instances').
+
+    Parameters:
+        - task: tuple of the solution directory, the instance parameters (dem,loc,n,p,i), the instance, its travel time matrix, its demand vector, and the capacities, lifespans, and rates to evaluate with
+
+    Returns: lines to write
+    """
+
+    (directory,dem,loc,n,p,i,instance,distances,demands,capacities,lifespans,rates) = task
+
+    lines = []
+    for (Q,B,r) in product( capacities, lifespans, rates ):
+        try:
+            solution = _as_index_arrays( read_solution_for_canatasagun_instance( directory, dem, loc, n, p, i, Q, B, r ) )
+            makespan = evaluate( instance, Q, B, r, solution, check_feasibility= True, print_reason= False, print_solution= False, distances= distances, demands= demands )
+
+            lines.append( f'{i};{Q};{B};{r};{makespan}\n' )
+        except:
+            lines.append( f'{i};{Q};{B};{r};-\n' )
+
+    return lines
+
+def evaluate_vns_solutions_for_canatasagun_instances( dems:List[int], locs:List[int], nps:Tuple[List[int],List[int]], instances:List[int], capacities:List[int], lifespans:List[int], rates:List[int], rounding_func:Callable[[float],float]= None, workers:int= None ):
     """
     Evaluates the solutions for Can Atasagun & Karaoglan instances of the variable neighborhood search of Horvath.
+    Instances are evaluated in parallel.
 
     Parameters:
         - ...
+        - workers: number of worker processes (None: number of processors)
     """
 
     directory  = os.path.join( SOLUTION_DIRECTORY, 'canatasagun', 'horvath_vns' )
     outputfile = os.path.join( OUTPUT_DIRECTORY, __tempfile )
 
-    with open( outputfile, 'w' ) as f:    
-        for (dem,loc,(n,p),i) in product( dems, locs, nps, instances ):
-            instance = read_canatasagun_instance( dem, loc, n, p, i )
+    # directory and travel times are determined here, as workers may not see changes of module globals, and the rounding function (e.g., a lambda) may not be picklable
+    tasks = []
+    for (dem,loc,(n,p),i) in product( dems, locs, nps, instances ):
+        instance  = read_canatasagun_instance( dem, loc, n, p, i )
+        distances = _distance_matrix( rounding_func, read_canatasagun_instance, dem, loc, n, p, i )
+        demands   = _demand_vector( read_canatasagun_instance, dem, loc, n, p, i )
 
-            for (Q,B,r) in product( capacities, lifespans, rates ):
-                try:
-                    solution = read_solution_for_canatasagun_instance( directory, dem, loc, n, p, i, Q, B, r )
-                    makespan = evaluate( instance, Q, B, r, solution, rounding_func= rounding_func, check_feasibility= True, print_reason= False, print_solution= False )
-                    
-                    f.write( f'{i};{Q};{B};{r};{makespan}\n' )
-                except:
-                    f.write( f'{i};{Q};{B};{r};-\n' )
+        tasks.append( (directory,dem,loc,n,p,i,instance,distances,demands,capacities,lifespans,rates) )
+
+    with open( outputfile, 'w', buffering= __buffsize ) as f, ProcessPoolExecutor( max_workers= workers ) as executor:
+        for lines in executor.map( _evaluate_vns_solutions_for_canatasagun_instance, tasks, chunksize= 4 ):
+            f.write( ''.join( lines ) )
 
     print( f'values are written into "{outputfile}"' )
 
@@ -279,19 +594,19 @@ def evaluate_lacomme_et_al_solutions_for_geismar_instances( instances:List[int],
 
     outputfile = os.path.join( OUTPUT_DIRECTORY, __tempfile )
 
-    with open( outputfile, 'w' ) as f:
+    with open( outputfile, 'w', buffering= __buffsize ) as f:
         for i in instances:
-            instance = read_geismar_instance( i )
+            instance  = read_geismar_instance( i )
+            distances = np.stack( [ _distance_matrix( rounding_func, read_geismar_instance, i ) for rounding_func in [None, round2, floor] ] )
+            demands   = _demand_vector( read_geismar_instance, i )
 
+            lines = []
             for (Q,B,r) in product(capacities,lifespans,rates):
-                values = []
-                for rep in [1,2,3,4,5]:
-                    solution = read_solution_for_geismar_instance( os.path.join( SOLUTION_DIRECTORY, 'geismar', 'lacomme_et_al', f'rep{rep}' ), i, Q, B, r )
-
-                    origi_value = evaluate( instance, Q, B, r, solution, check_feasibility= check_feasibility, rounding_func= None )
-                    round_value = evaluate( instance, Q, B, r, solution, check_feasibility= check_feasibility, rounding_func= lambda x: round(x,2) )
-                    floor_value = evaluate( instance, Q, B, r, solution, check_feasibility= check_feasibility, rounding_func= floor )
+                reps      = [1,2,3,4,5]
+                solutions = [ _as_index_arrays( read_solution_for_geismar_instance( os.path.join( SOLUTION_DIRECTORY, 'geismar', 'lacomme_et_al', f'rep{rep}' ), i, Q, B, r ) ) for rep in reps ]
 
+                values = []
+                for (rep, (origi_value, round_value, floor_value)) in zip( reps, evaluate_solutions_with_distances( instance, Q, B, r, solutions, distances, demands, check_feasibility ) ):
                     values.append( origi_value )
                     values.append( round_value )
                     values.append( floor_value )
@@ -301,7 +616,9 @@ def evaluate_lacomme_et_al_solutions_for_geismar_instances( instances:List[int],
                     elif round_value == INF_RETURN:
                         round_infeasible_cases.append( (i,Q,B,r,rep) )
 
-                f.write( f'{i};{Q};{B};{r};' + ';'.join( map(str,values) ) + '\n' )
+                lines.append( f'{i};{Q};{B};{r};' + ';'.join( map(str,values) ) + '\n' )
+
+            f.write( ''.join( lines ) )
         
         if check_feasibility:
             print( f'FLOOR infeasible cases: {len(floor_infeasible_cases):3d}' )
@@ -348,21 +665,26 @@ def evaluate_bestknown_solutions_for_geismar_instances( instances:List[int], cap
         - capacities:    capacity values to evaluate with
         - lifespans:     lifespan values to evaluate with
         - rates:         production rates to evaluate with
-        - rounding_func: rounding function
+        - rounding_func: rounding function (travel times are cached by its identity, see '_distance_matrix')
     """
 
     directory  = os.path.join( SOLUTION_DIRECTORY, 'geismar', 'best_known' )
     outputfile = os.path.join( OUTPUT_DIRECTORY, __tempfile )
 
-    with open( outputfile, 'w' ) as f:
+    with open( outputfile, 'w', buffering= __buffsize ) as f:
         for i in instances:
-            instance = read_geismar_instance( i )
+            instance  = read_geismar_instance( i )
+            distances = _distance_matrix( rounding_func, read_geismar_instance, i )
+            demands   = _demand_vector( read_geismar_instance, i )
 
+            lines = []
             for (Q,B,r) in product(capacities,lifespans,rates):
-                solution = read_solution_for_geismar_instance( directory, i, Q, B, r )
-                round_value = evaluate( instance, Q, B, r, solution, check_feasibility= True, rounding_func= rounding_func )
+                solution = _as_index_arrays( read_solution_for_geismar_instance( directory, i, Q, B, r ) )
+                round_value = evaluate( instance, Q, B, r, solution, check_feasibility= True, distances= distances, demands= demands )
+
+                lines.append( f'{i};{Q};{B};{r};{round_value}\n' )
 
-                f.write( f'{i};{Q};{B};{r};{round_value}\n' )
+            f.write( ''.join( lines ) )
 
         print( f'values are written into "{outputfile}"' )
 
@@ -376,9 +698,9 @@ def evaluate_lacomme_et_al_solution_for_geismar_instance( i:int, Q:int, B:int, r
     """
 
     instance = read_geismar_instance( i )
-    solution = read_solution_for_geismar_instance( os.path.join( SOLUTION_DIRECTORY, 'lacomme_et_al', f'rep{rep}' ), i, Q, B, r )
+    solution = _as_index_arrays( read_solution_for_geismar_instance( os.path.join( SOLUTION_DIRECTORY, 'lacomme_et_al', f'rep{rep}' ), i, Q, B, r ) )
         
-    return evaluate( instance, Q, B, r, solution, rounding_func, check_feasibility, print_reason, print_solution )
+    return evaluate( instance, Q, B, r, solution, rounding_func, check_feasibility, print_reason, print_solution, distances= _distance_matrix( rounding_func, read_geismar_instance, i ), demands= _demand_vector( read_geismar_instance, i ) )
 
 def evaluate_vns_solution_for_geismar_instance( i:int, Q:int, B:int, r:int, rounding_func:Callable[[float],float]= None, check_feasibility:bool= True, print_reason:bool= False, print_solution:bool= False ) -> float:
     """
@@ -386,9 +708,9 @@ def evaluate_vns_solution_for_geismar_instance( i:int, Q:int, B:int, r:int, roun
     """
     
     instance = read_geismar_instance( i )
-    solution = read_solution_for_geismar_instance( os.path.join( SOLUTION_DIRECTORY, 'geismar', 'horvath_vns' ), i, Q, B, r )
+    solution = _as_index_arrays( read_solution_for_geismar_instance( os.path.join( SOLUTION_DIRECTORY, 'geismar', 'horvath_vns' ), i, Q, B, r ) )
         
-    return evaluate( instance, Q, B, r, solution, rounding_func, check_feasibility, print_reason, print_solution )
+    return evaluate( instance, Q, B, r, solution, rounding_func, check_feasibility, print_reason, print_solution, distances= _distance_matrix( rounding_func, read_geismar_instance, i ), demands= _demand_vector( read_geismar_instance, i ) )
 
 def evaluate_vns_solution_for_canatasagun_instance( dem:int, loc:int, n:int, p:int, i:int, Q:int, B:int, r:int, rounding_func:Callable[[float],float]= None, check_feasibility:bool= True, print_reason:bool= False, print_solution:bool= False ):
     """
@@ -399,14 +721,14 @@ def evaluate_vns_solution_for_canatasagun_instance( dem:int, loc:int, n:int, p:i
     """
 
     instance = read_canatasagun_instance( dem, loc, n, p, i )
-    solution = read_solution_for_canatasagun_instance( os.path.join( SOLUTION_DIRECTORY, 'canatasagun', 'horvath_vns' ), dem, loc, n, p, i, Q, B, r )
+    solution = _as_index_arrays( read_solution_for_canatasagun_instance( os.path.join( SOLUTION_DIRECTORY, 'canatasagun', 'horvath_vns' ), dem, loc, n, p, i, Q, B, r ) )
 
-    return evaluate( instance, Q, B, r, solution, rounding_func, check_feasibility, print_reason, print_solution )
+    return evaluate( instance, Q, B, r, solution, rounding_func, check_feasibility, print_reason, print_solution, distances= _distance_matrix( rounding_func, read_canatasagun_instance, dem, loc, n, p, i ), demands= _demand_vector( read_canatasagun_instance, dem, loc, n, p, i ) )
 
 if __name__ == '__main__':
     #rfunc = None
     #rfunc = floor
-    rfunc = lambda x : round(x,2)
+    rfunc = round2
 
     # single-plant instances of Geismar et al.
     #evaluate_lacomme_et_al_solutions_for_geismar_instances( instances= [1,2,3,4,5,6], capacities= [300,600], lifespans= [300,600], rates= [1,2,3], check_feasibility= True )